@@ -2,44 +2,192 @@
 import os
 import json
 import re
+import asyncio
+import hashlib
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional
+import anthropic
+import httpx
+from pydantic import BaseModel, Field
 from langchain_anthropic import ChatAnthropic
-from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain.memory import ConversationBufferMemory
-from langchain_core.messages import HumanMessage, AIMessage
+from langchain.memory import ConversationBufferWindowMemory
+from cachetools import TTLCache
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 
+MODEL_NAME = "claude-sonnet-4-20250514"
+
+# One shared Anthropic client for every agent - each ChatAnthropic instance
+# carries its own httpx connection pool, so per-agent clients meant four-plus
+# separate pools. Temperature variants are lightweight bound views over the
+# same client, not new HTTP clients.
+_anthropic_llm = ChatAnthropic(
+    anthropic_api_key=ANTHROPIC_API_KEY,
+    model=MODEL_NAME,
+    temperature=0
+)
+_chat_llm = _anthropic_llm.bind(temperature=0.7)
+
+# Persistent HTTP/2 transports for the Claude API. Keep-alive avoids the
+# TCP+TLS handshake on every call, and HTTP/2 multiplexes the concurrent
+# evaluation batch over a single connection. ChatAnthropic builds its own
+# transports and exposes no http_client knob, so the shared ones are swapped
+# in underneath; the bound temperature views above reuse them too.
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=50, max_connections=100)
+_anthropic_llm._client = anthropic.Anthropic(
+    api_key=ANTHROPIC_API_KEY,
+    http_client=httpx.Client(http2=True, limits=_HTTP_LIMITS, timeout=30),
+)
+_anthropic_llm._async_client = anthropic.AsyncAnthropic(
+    api_key=ANTHROPIC_API_KEY,
+    http_client=httpx.AsyncClient(http2=True, limits=_HTTP_LIMITS, timeout=30),
+)
+
+# Skill dictionary for the fallback keyword scan. The automaton below is
+# compiled once at import time and matches every skill in a single pass over
+# the text, rather than one substring scan per skill; longest alternative
+# wins, so e.g. "JavaScript" no longer also reports "Java".
+COMMON_SKILLS = [
+    "React", "Python", "JavaScript", "TypeScript", "Design", "Figma",
+    "Node.js", "Product Management", "UI/UX", "SQL", "AWS", "Docker",
+    "Kubernetes", "Machine Learning", "Data Science", "Java", "Go",
+    "Ruby", "PHP", "Swift", "Kotlin", "Flutter", "Vue", "Angular"
+]
+
+_SKILL_CANONICAL = {skill.lower(): skill for skill in COMMON_SKILLS}
+_SKILL_PATTERN = re.compile('|'.join(
+    re.escape(skill.lower())
+    for skill in sorted(COMMON_SKILLS, key=len, reverse=True)
+))
+
+# Exact-match cache for deterministic (temperature=0) LLM results. Identical
+# inputs produce identical outputs at temperature 0, so repeat searches and
+# re-evaluations can skip the Claude call entirely.
+_RESPONSE_CACHE_MAXSIZE = 2048
+_response_cache: "OrderedDict[str, Any]" = OrderedDict()
+
+
+class ExtractedProfile(BaseModel):
+    """Profile fields extracted from a conversation"""
+    title: Optional[str] = Field(None, description="Professional title/role, e.g. 'Senior Software Engineer'")
+    skills: List[str] = Field(default_factory=list, description="3-5 technical or professional skills, normalized names")
+    experience_years: Optional[int] = Field(None, description="Years of experience, number only")
+    availability: Optional[str] = Field(None, description="One of: full-time, part-time, freelance, not-available")
+    location: Optional[Dict[str, str]] = Field(None, description="{'city': ..., 'country': ...}")
+    bio: Optional[str] = Field(None, description="Brief 2-3 sentence professional bio")
+
+
+class StructuredSearchQuery(BaseModel):
+    """Structured form of a natural language search request"""
+    skills: List[str] = Field(default_factory=list, description="Required skills, normalized names")
+    experience_level: Optional[str] = Field(None, description="junior (0-2 years), mid (3-5), or senior (6+)")
+    min_experience_years: Optional[int] = Field(None, description="Minimum years of experience if stated")
+    availability: Optional[str] = Field(None, description="full-time, part-time, or freelance")
+    location: Optional[Dict[str, str]] = Field(None, description="{'city': ..., 'country': ...}")
+
+
+class MatchEvaluation(BaseModel):
+    """Evaluation of a candidate against a search request"""
+    is_match: bool = Field(False, description="True if match_score >= 0.3")
+    match_score: float = Field(0.0, description="0.0 to 1.0, weighted average of criteria matches")
+    matched_skills: List[str] = Field(default_factory=list, description="Skills that matched")
+    explanation: str = Field("No explanation provided", description="Brief 1-2 sentence explanation")
+
+
+def _cache_key(payload: str) -> str:
+    """Build a cache key from the canonical text of an LLM call"""
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _cache_get(key: str) -> Optional[Any]:
+    """Look up a cached result, refreshing its LRU position"""
+    result = _response_cache.get(key)
+    if result is not None:
+        _response_cache.move_to_end(key)
+    return result
+
+
+def _cache_put(key: str, value: Any):
+    """Store a result, evicting the least recently used entry if full"""
+    _response_cache[key] = value
+    if len(_response_cache) > _RESPONSE_CACHE_MAXSIZE:
+        _response_cache.popitem(last=False)
+
 
 class ProfileBuilderAgent:
     """Agent that builds user profiles through conversation"""
 
-    def __init__(self):
-        self.llm = ChatAnthropic(
-            anthropic_api_key=ANTHROPIC_API_KEY,
-            model="claude-sonnet-4-20250514",
-            temperature=0.7
-        )
+    # Required fields for a complete profile, in display order
+    REQUIRED_FIELDS = ('title', 'skills', 'experience_years', 'availability', 'location', 'bio')
 
-        self.extraction_llm = ChatAnthropic(
-            anthropic_api_key=ANTHROPIC_API_KEY,
-            model="claude-sonnet-4-20250514",
-            temperature=0
-        )
+    # Static instructions, kept byte-identical across turns so Anthropic
+    # prompt caching can hit on the prefix. Per-turn state (current profile,
+    # missing fields) travels in a separate trailing message instead.
+    STATIC_SYSTEM_PROMPT = """You are a friendly professional networking assistant helping a user build their profile.
+
+Your goal is to gather these details through natural conversation:
+1. Professional title/role
+2. Key skills (3-5 technical or professional skills)
+3. Years of experience
+4. Availability (full-time, part-time, freelance, or not available)
+5. Location (city and country)
+6. Brief bio (2-3 sentences about their professional background)
+
+Guidelines:
+- Ask ONE question at a time about the missing information
+- Be conversational, warm, and encouraging
+- Acknowledge information the user provides before asking the next question
+- If user provides multiple pieces of info, acknowledge all of them
+- When all information is collected, summarize the profile and confirm it looks good
+- Keep responses concise (2-3 sentences max)
+- Do NOT ask for information you already have
+
+The user's name, current profile state, and the fields still needed are provided in the final message."""
 
-        # Store per-user conversation memories
-        self.user_memories: Dict[str, ConversationBufferMemory] = {}
+    # Compact extraction instructions - the field schema itself is carried by
+    # the structured-output tool definition, so it is not repeated here
+    EXTRACTION_SYSTEM_PROMPT = """Extract profile fields from the conversation.
+Only include information explicitly stated by the user.
+Skills: normalize to standard names (e.g. "React.js" -> "React", "JS" -> "JavaScript").
+Experience: number of years only.
+Availability: one of full-time, part-time, freelance, not-available.
+Leave a field unset if the conversation adds nothing new for it."""
 
-        # Store per-user profile data being built
-        self.user_profiles: Dict[str, Dict] = {}
+    # Per-turn dynamic block appended after the conversation
+    STATE_MESSAGE_TEMPLATE = """You are helping {user_name}.
 
-        # Required fields for a complete profile
-        self.required_fields = ['title', 'skills', 'experience_years', 'availability', 'location', 'bio']
+Current profile status:
+{profile_json}
+
+Still needed: {missing_str}"""
 
-    def _get_memory(self, user_id: str) -> ConversationBufferMemory:
+    def __init__(self):
+        self.llm = _chat_llm
+        self.extraction_llm = _anthropic_llm
+
+        # Structured-output view - extraction calls return typed objects
+        # directly instead of JSON embedded in prose
+        self.extractor = self.extraction_llm.with_structured_output(ExtractedProfile)
+
+        # Per-user conversation memories and profile data. Bounded TTL caches
+        # keep a long-running process from accumulating every user that ever
+        # chatted; a user returning after the TTL simply starts fresh, which
+        # is acceptable for profile building.
+        self.user_memories: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
+        self.user_profiles: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
+
+        # Rendered transcript per user as (message_count, text) - the history
+        # only ever grows, so each turn renders just the new messages instead
+        # of re-rendering the whole transcript
+        self._rendered_transcripts: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
+
+    def _get_memory(self, user_id: str) -> ConversationBufferWindowMemory:
         """Get or create memory for a specific user"""
         if user_id not in self.user_memories:
-            self.user_memories[user_id] = ConversationBufferMemory(
+            # Window memory caps each conversation at the last k exchanges
+            self.user_memories[user_id] = ConversationBufferWindowMemory(
+                k=20,
                 memory_key="history",
                 return_messages=True
             )
@@ -60,63 +208,159 @@ class ProfileBuilderAgent:
 
     def _get_missing_fields(self, profile: Dict) -> List[str]:
         """Get list of fields that are still missing"""
-        missing = []
-        for field in self.required_fields:
-            value = profile.get(field)
-            if value is None or (isinstance(value, list) and len(value) == 0):
-                missing.append(field)
-        return missing
+        return [
+            field for field in self.REQUIRED_FIELDS
+            if profile.get(field) is None or profile.get(field) == []
+        ]
 
-    def _extract_profile_data(self, conversation_history: str, current_profile: Dict) -> Dict:
-        """Extract profile information from conversation using Claude"""
+    # Bare acknowledgements that cannot carry profile data. Anything not in
+    # this set goes to the extraction model - even two-word replies like
+    # "software engineer" routinely answer a direct question.
+    _ACK_MESSAGES = frozenset({
+        'ok', 'okay', 'k', 'yes', 'yep', 'yeah', 'yup', 'no', 'nope', 'sure',
+        'thanks', 'thank you', 'thx', 'great', 'cool', 'nice', 'fine',
+        'perfect', 'awesome', 'sounds good', 'got it', 'alright', 'all right',
+        'hi', 'hello', 'hey', 'hmm', 'done', 'next', 'continue', 'go on',
+        'go ahead', 'please continue',
+    })
+
+    def _should_extract(self, user_message: str, profile: Dict) -> bool:
+        """Decide whether a turn can plausibly contain new profile information.
+
+        Skips the extraction LLM call once the profile is complete, or when
+        the message is a bare acknowledgement ("ok", "sounds good"). Every
+        other turn is extracted while fields are still missing.
+        """
+        if not self._get_missing_fields(profile):
+            return False
+
+        return user_message.strip().strip('.,!?').lower() not in self._ACK_MESSAGES
+
+    def _render_conversation(self, user_id: str, messages: List, user_message: str) -> str:
+        """Render the transcript plus the new user message as one string"""
+
+        count, rendered, last_msg = self._rendered_transcripts.get(user_id, (0, "", None))
+        if count > len(messages) or (count and messages[count - 1] is not last_msg):
+            # Memory was reset or the history window slid since the last
+            # render - the cached prefix no longer lines up, so re-render
+            count, rendered = 0, ""
+
+        if count < len(messages):
+            new_part = "\n".join(
+                f"{'User' if isinstance(m, HumanMessage) else 'Agent'}: {m.content}"
+                for m in messages[count:]
+            )
+            rendered = f"{rendered}\n{new_part}" if rendered else new_part
+            self._rendered_transcripts[user_id] = (len(messages), rendered, messages[-1])
 
-        extraction_prompt = f"""Analyze this conversation and extract any profile information mentioned.
+        return f"{rendered}\nUser: {user_message}" if rendered else f"User: {user_message}"
 
-Current profile data (update only if new information is found):
-{json.dumps(current_profile, indent=2)}
+    def _build_extraction_prompt(self, conversation_history: str, current_profile: Dict) -> List:
+        """Build the messages used to extract profile data from a conversation"""
 
-Conversation:
-{conversation_history}
+        missing = self._get_missing_fields(current_profile)
+        missing_str = ', '.join(missing) if missing else 'none'
 
-Extract and return a JSON object with these fields (keep existing values if no new info found):
-{{
-    "title": "Professional title/role (e.g., 'Senior Software Engineer', 'UX Designer')" or null,
-    "skills": ["skill1", "skill2", ...] (3-5 technical or professional skills) or [],
-    "experience_years": number of years of experience or null,
-    "availability": "full-time" or "part-time" or "freelance" or "not-available" or null,
-    "location": {{"city": "City Name", "country": "Country"}} or null,
-    "bio": "Brief 2-3 sentence professional bio" or null
-}}
+        return [
+            ("system", self.EXTRACTION_SYSTEM_PROMPT),
+            ("human", f"Conversation:\n{conversation_history}\n\nFields still needed: {missing_str}")
+        ]
 
-Rules:
-- Only include information explicitly stated by the user
-- For skills, normalize to standard names (e.g., "React.js" -> "React", "JS" -> "JavaScript")
-- For experience, extract the number only
-- For availability, map to one of the four options
-- Keep existing values if no new information is provided for that field
-- Return ONLY the JSON object, no other text"""
+    def _merge_extraction(self, extracted: ExtractedProfile, current_profile: Dict) -> Dict:
+        """Merge extracted fields with the current profile, keeping existing values"""
+
+        merged = current_profile.copy()
+        for key, value in extracted.model_dump().items():
+            if value is not None and value != [] and value != "":
+                merged[key] = value
+        return merged
+
+    def _extract_profile_data(self, conversation_history: str, current_profile: Dict) -> Dict:
+        """Extract profile information from conversation using Claude"""
+
+        extraction_prompt = self._build_extraction_prompt(conversation_history, current_profile)
 
         try:
-            response = self.extraction_llm.invoke(extraction_prompt)
-            content = response.content
+            extracted = self.extractor.invoke(extraction_prompt)
+            return self._merge_extraction(extracted, current_profile)
+        except Exception as e:
+            print(f"Extraction error: {e}")
 
-            # Extract JSON from response
-            json_match = re.search(r'\{[\s\S]*\}', content)
-            if json_match:
-                extracted = json.loads(json_match.group())
+        return current_profile
+
+    async def _aextract_profile_data(self, conversation_history: str, current_profile: Dict) -> Dict:
+        """Async variant of _extract_profile_data"""
 
-                # Merge with current profile, keeping existing values if new ones are null
-                merged = current_profile.copy()
-                for key, value in extracted.items():
-                    if value is not None and value != [] and value != "":
-                        merged[key] = value
+        extraction_prompt = self._build_extraction_prompt(conversation_history, current_profile)
 
-                return merged
+        try:
+            extracted = await self.extractor.ainvoke(extraction_prompt)
+            return self._merge_extraction(extracted, current_profile)
         except Exception as e:
             print(f"Extraction error: {e}")
 
         return current_profile
 
+    def _build_state_message(self, user_name: str, updated_profile: Dict, missing_fields: List[str]) -> str:
+        """Build the per-turn profile state block sent after the conversation"""
+
+        profile_json = json.dumps(updated_profile, indent=2)
+        missing_str = ', '.join(missing_fields) if missing_fields else 'All information collected!'
+
+        return self.STATE_MESSAGE_TEMPLATE.format(
+            user_name=user_name,
+            profile_json=profile_json,
+            missing_str=missing_str
+        )
+
+    def _build_chat_messages(self, history_messages: List, user_message: str, state_message: str) -> List:
+        """Build the message list for a conversation turn.
+
+        Messages go straight to the model - no ChatPromptTemplate, so the
+        text needs no brace escaping and the system prompt bytes are exactly
+        what the cache_control marker covers.
+        """
+
+        # Static system prompt, marked cacheable so the prefix hits
+        # Anthropic's prompt cache on every turn after the first
+        system = SystemMessage(content=[{
+            "type": "text",
+            "text": self.STATIC_SYSTEM_PROMPT,
+            "cache_control": {"type": "ephemeral"}
+        }])
+
+        # History messages are already HumanMessage/AIMessage instances;
+        # append the current message, then the dynamic profile state
+        return [
+            system,
+            *history_messages,
+            HumanMessage(content=user_message),
+            HumanMessage(content=state_message),
+        ]
+
+    def _finish_turn(self, memory: ConversationBufferWindowMemory, user_message: str,
+                     response_text: str, updated_profile: Dict,
+                     missing_fields: List[str]) -> Dict[str, Any]:
+        """Record the exchange in memory and build the chat result"""
+
+        memory.chat_memory.add_user_message(user_message)
+        memory.chat_memory.add_ai_message(response_text)
+
+        # ConversationBufferWindowMemory only windows on *read* through
+        # load_memory_variables; chat_memory.messages itself grows without
+        # bound. Trim the stored history here so every prompt built from it
+        # really is capped at the last k exchanges.
+        max_messages = 2 * memory.k
+        if len(memory.chat_memory.messages) > max_messages:
+            memory.chat_memory.messages = memory.chat_memory.messages[-max_messages:]
+
+        return {
+            "message": response_text,
+            "is_complete": len(missing_fields) == 0,
+            "profile_data": updated_profile,
+            "missing_fields": missing_fields
+        }
+
     def chat(self, user_message: str, user_id: str, user_name: str = "User") -> Dict[str, Any]:
         """Continue profile building conversation for a specific user"""
 
@@ -125,86 +369,119 @@ Rules:
 
         # Get conversation history as string for extraction
         history_messages = memory.chat_memory.messages
-        conversation_text = "\n".join([
-            f"{'User' if isinstance(m, HumanMessage) else 'Agent'}: {m.content}"
-            for m in history_messages
-        ])
-        conversation_text += f"\nUser: {user_message}"
+        conversation_text = self._render_conversation(user_id, history_messages, user_message)
 
         # Extract any profile data from the conversation so far
-        updated_profile = self._extract_profile_data(conversation_text, profile)
+        if self._should_extract(user_message, profile):
+            updated_profile = self._extract_profile_data(conversation_text, profile)
+        else:
+            updated_profile = profile
         self.user_profiles[user_id] = updated_profile
 
         # Determine what's missing
         missing_fields = self._get_missing_fields(updated_profile)
-        is_complete = len(missing_fields) == 0
 
-        # Build the prompt for the conversation
-        # Escape curly braces in JSON to prevent LangChain template interpretation
-        profile_json = json.dumps(updated_profile, indent=2).replace("{", "{{").replace("}", "}}")
-        missing_str = ', '.join(missing_fields) if missing_fields else 'All information collected!'
+        state_message = self._build_state_message(user_name, updated_profile, missing_fields)
+        messages = self._build_chat_messages(history_messages, user_message, state_message)
 
-        system_prompt = f"""You are a friendly professional networking assistant helping {user_name} build their profile.
+        response = self.llm.invoke(messages)
 
-Your goal is to gather these details through natural conversation:
-1. Professional title/role
-2. Key skills (3-5 technical or professional skills)
-3. Years of experience
-4. Availability (full-time, part-time, freelance, or not available)
-5. Location (city and country)
-6. Brief bio (2-3 sentences about their professional background)
+        return self._finish_turn(memory, user_message, response.content,
+                                 updated_profile, missing_fields)
 
-Current profile status:
-{profile_json}
+    async def astream_chat(self, user_message: str, user_id: str, user_name: str = "User"):
+        """Stream a chat turn as it is generated.
 
-Still needed: {missing_str}
+        Yields {'type': 'delta', 'text': ...} events as response tokens
+        arrive, followed by a single {'type': 'result', ...} event carrying
+        the same payload chat() returns.
+        """
 
-Guidelines:
-- Ask ONE question at a time about the missing information
-- Be conversational, warm, and encouraging
-- Acknowledge information the user provides before asking the next question
-- If user provides multiple pieces of info, acknowledge all of them
-- When all information is collected, summarize the profile and confirm it looks good
-- Keep responses concise (2-3 sentences max)
-- Do NOT ask for information you already have"""
+        memory = self._get_memory(user_id)
+        profile = self._get_profile(user_id)
+
+        history_messages = memory.chat_memory.messages
+        conversation_text = self._render_conversation(user_id, history_messages, user_message)
+
+        # Extraction runs in the background while tokens stream to the user,
+        # unless this turn cannot contain new profile information
+        extract_task = None
+        if self._should_extract(user_message, profile):
+            extract_task = asyncio.create_task(
+                self._aextract_profile_data(conversation_text, profile)
+            )
+
+        state_message = self._build_state_message(
+            user_name, profile, self._get_missing_fields(profile)
+        )
+        messages = self._build_chat_messages(history_messages, user_message, state_message)
+
+        chunks = []
+        async for chunk in self.llm.astream(messages):
+            text = chunk.content
+            if isinstance(text, list):
+                text = "".join(
+                    part.get("text", "") if isinstance(part, dict) else str(part)
+                    for part in text
+                )
+            if text:
+                chunks.append(text)
+                yield {"type": "delta", "text": text}
+
+        response_text = "".join(chunks)
+        updated_profile = await extract_task if extract_task else profile
+        self.user_profiles[user_id] = updated_profile
 
-        # Build messages for the LLM
-        messages = [("system", system_prompt)]
+        missing_fields = self._get_missing_fields(updated_profile)
+        result = self._finish_turn(memory, user_message, response_text,
+                                   updated_profile, missing_fields)
+        yield {"type": "result", **result}
 
-        # Add conversation history
-        for msg in history_messages:
-            if isinstance(msg, HumanMessage):
-                messages.append(("human", msg.content))
-            else:
-                messages.append(("assistant", msg.content))
+    async def achat(self, user_message: str, user_id: str, user_name: str = "User") -> Dict[str, Any]:
+        """Async variant of chat - frees the event loop during LLM calls"""
 
-        # Add current message
-        messages.append(("human", user_message))
+        memory = self._get_memory(user_id)
+        profile = self._get_profile(user_id)
 
-        # Create prompt and get response
-        prompt = ChatPromptTemplate.from_messages(messages)
-        chain = prompt | self.llm
+        # Get conversation history as string for extraction
+        history_messages = memory.chat_memory.messages
+        conversation_text = self._render_conversation(user_id, history_messages, user_message)
+
+        # Kick off extraction without waiting on it - the conversational
+        # reply has no data dependency on the extraction result. Skipped
+        # entirely when the turn cannot contain new profile information.
+        extract_task = None
+        if self._should_extract(user_message, profile):
+            extract_task = asyncio.create_task(
+                self._aextract_profile_data(conversation_text, profile)
+            )
 
-        response = chain.invoke({})
-        response_text = response.content
+        # Build the reply from the pre-turn profile so both calls overlap
+        state_message = self._build_state_message(
+            user_name, profile, self._get_missing_fields(profile)
+        )
+        messages = self._build_chat_messages(history_messages, user_message, state_message)
 
-        # Update memory with this exchange
-        memory.chat_memory.add_user_message(user_message)
-        memory.chat_memory.add_ai_message(response_text)
+        if extract_task:
+            updated_profile, response = await asyncio.gather(
+                extract_task, self.llm.ainvoke(messages)
+            )
+        else:
+            updated_profile = profile
+            response = await self.llm.ainvoke(messages)
+        self.user_profiles[user_id] = updated_profile
 
-        return {
-            "message": response_text,
-            "is_complete": is_complete,
-            "profile_data": updated_profile,
-            "missing_fields": missing_fields
-        }
+        # Determine what's missing
+        missing_fields = self._get_missing_fields(updated_profile)
+
+        return self._finish_turn(memory, user_message, response.content,
+                                 updated_profile, missing_fields)
 
     def reset(self, user_id: str):
         """Reset conversation memory and profile for a specific user"""
-        if user_id in self.user_memories:
-            del self.user_memories[user_id]
-        if user_id in self.user_profiles:
-            del self.user_profiles[user_id]
+        self.user_memories.pop(user_id, None)
+        self.user_profiles.pop(user_id, None)
+        self._rendered_transcripts.pop(user_id, None)
 
     def get_profile(self, user_id: str) -> Dict:
         """Get the current profile data for a user"""
@@ -214,50 +491,29 @@ Guidelines:
 class SearchAgent:
     """Agent that processes search requests and creates structured queries"""
 
-    def __init__(self):
-        self.llm = ChatAnthropic(
-            anthropic_api_key=ANTHROPIC_API_KEY,
-            model="claude-sonnet-4-20250514",
-            temperature=0
-        )
-
-    def process_search(self, query_text: str) -> Dict[str, Any]:
-        """Convert natural language search to structured query"""
-
-        prompt = f"""Convert this professional networking search request into a structured format.
+    # Built once - per call only the query text is substituted
+    SEARCH_PROMPT_TEMPLATE = """Convert this professional networking search request into a structured format.
 
 Search request: "{query_text}"
 
-Extract the following (use null if not mentioned):
+Extract the following (leave unset if not mentioned):
 1. Skills required - normalize skill names (e.g., "React.js" -> "React", "ML" -> "Machine Learning")
 2. Experience level - "junior" (0-2 years), "mid" (3-5 years), "senior" (6+ years), or specific years
-3. Availability preference - "full-time", "part-time", "freelance", or null
-4. Location preference - city and/or country if mentioned
+3. Availability preference - "full-time", "part-time", or "freelance"
+4. Location preference - city and/or country if mentioned"""
 
-Return ONLY a JSON object in this exact format:
-{{
-    "skills": ["skill1", "skill2"],
-    "experience_level": "senior" or null,
-    "min_experience_years": 5 or null,
-    "availability": "freelance" or null,
-    "location": {{"city": "San Francisco", "country": "USA"}} or null
-}}"""
+    def __init__(self):
+        self.llm = _anthropic_llm
+        self.structurer = self.llm.with_structured_output(StructuredSearchQuery)
 
-        response = self.llm.invoke(prompt)
+    def _build_search_prompt(self, query_text: str) -> str:
+        """Build the prompt that structures a search request"""
 
-        try:
-            content = response.content
-            json_match = re.search(r'\{[\s\S]*\}', content)
-            if json_match:
-                structured_query = json.loads(json_match.group())
-                return {
-                    "original_query": query_text,
-                    "structured_query": structured_query
-                }
-        except Exception as e:
-            print(f"Search parsing error: {e}")
+        return self.SEARCH_PROMPT_TEMPLATE.format(query_text=query_text)
+
+    def _fallback_query(self, query_text: str) -> Dict[str, Any]:
+        """Basic keyword extraction when the LLM call fails"""
 
-        # Fallback to basic extraction
         return {
             "original_query": query_text,
             "structured_query": {
@@ -269,20 +525,64 @@ Return ONLY a JSON object in this exact format:
             }
         }
 
+    def process_search(self, query_text: str) -> Dict[str, Any]:
+        """Convert natural language search to structured query"""
+
+        prompt = self._build_search_prompt(query_text)
+        key = _cache_key(prompt)
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            structured = self.structurer.invoke(prompt)
+            # structured is None when the model emits no tool call; the
+            # resulting AttributeError takes the fallback like any parse error
+            result = {
+                "original_query": query_text,
+                "structured_query": structured.model_dump()
+            }
+        except Exception as e:
+            print(f"Search parsing error: {e}")
+            return self._fallback_query(query_text)
+
+        _cache_put(key, result)
+        return result
+
+    async def aprocess_search(self, query_text: str) -> Dict[str, Any]:
+        """Async variant of process_search"""
+
+        prompt = self._build_search_prompt(query_text)
+        key = _cache_key(prompt)
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            structured = await self.structurer.ainvoke(prompt)
+            # structured is None when the model emits no tool call; the
+            # resulting AttributeError takes the fallback like any parse error
+            result = {
+                "original_query": query_text,
+                "structured_query": structured.model_dump()
+            }
+        except Exception as e:
+            print(f"Search parsing error: {e}")
+            return self._fallback_query(query_text)
+
+        _cache_put(key, result)
+        return result
+
     def _extract_skills(self, text: str) -> List[str]:
-        """Simple skill extraction fallback"""
-        common_skills = [
-            "React", "Python", "JavaScript", "TypeScript", "Design", "Figma",
-            "Node.js", "Product Management", "UI/UX", "SQL", "AWS", "Docker",
-            "Kubernetes", "Machine Learning", "Data Science", "Java", "Go",
-            "Ruby", "PHP", "Swift", "Kotlin", "Flutter", "Vue", "Angular"
-        ]
+        """Simple skill extraction fallback - one pass over the text"""
 
         found_skills = []
-        text_lower = text.lower()
+        seen = set()
 
-        for skill in common_skills:
-            if skill.lower() in text_lower:
+        for match in _SKILL_PATTERN.finditer(text.lower()):
+            skill = _SKILL_CANONICAL[match.group()]
+            if skill not in seen:
+                seen.add(skill)
                 found_skills.append(skill)
 
         return found_skills if found_skills else ["General"]
@@ -291,23 +591,17 @@ Return ONLY a JSON object in this exact format:
 class MatchEvaluationAgent:
     """Agent that evaluates if a candidate matches a request"""
 
-    def __init__(self):
-        self.llm = ChatAnthropic(
-            anthropic_api_key=ANTHROPIC_API_KEY,
-            model="claude-sonnet-4-20250514",
-            temperature=0
-        )
+    # Cap on concurrent Claude calls when evaluating a batch of candidates
+    MAX_CONCURRENT_EVALUATIONS = 10
 
-    def evaluate(self, request_query: Dict, candidate_profile: Dict) -> Dict[str, Any]:
-        """Evaluate if candidate matches the request using AI"""
-
-        prompt = f"""Evaluate how well this candidate matches the search request.
+    # Built once - per call only the two JSON blobs are substituted
+    EVALUATION_PROMPT_TEMPLATE = """Evaluate how well this candidate matches the search request.
 
 Search Request:
-{json.dumps(request_query, indent=2)}
+{request_json}
 
 Candidate Profile:
-{json.dumps(candidate_profile, indent=2)}
+{profile_json}
 
 Evaluation criteria:
 1. Skills match - How many required skills does the candidate have?
@@ -315,39 +609,98 @@ Evaluation criteria:
 3. Availability match - Does their availability match what's needed?
 4. Location match - Are they in the desired location (if specified)?
 
-Return ONLY a JSON object:
-{{
-    "is_match": true or false (true if match_score >= 0.3),
-    "match_score": 0.0 to 1.0 (weighted average of criteria matches),
-    "matched_skills": ["skill1", "skill2"] (skills that matched),
-    "explanation": "Brief 1-2 sentence explanation of why they match or don't match"
-}}
-
 Be generous with matching - consider related skills (e.g., "React" matches "Frontend Development")."""
 
+    def __init__(self):
+        self.llm = _anthropic_llm
+        self.evaluator = self.llm.with_structured_output(MatchEvaluation)
+
+        # Lowercased skill sets keyed by the original skill tuple, so a
+        # profile evaluated against many requests (or vice versa) is only
+        # lowercased once
+        self._skills_lower: "OrderedDict[tuple, frozenset]" = OrderedDict()
+
+    def _lower_skills(self, skills: List[str]) -> frozenset:
+        """Get the cached lowercase set for a list of skills"""
+        key = tuple(skills)
+        cached = self._skills_lower.get(key)
+        if cached is None:
+            cached = frozenset(s.lower() for s in skills)
+            self._skills_lower[key] = cached
+            if len(self._skills_lower) > 10_000:
+                self._skills_lower.popitem(last=False)
+        return cached
+
+    def _build_evaluation_prompt(self, request_query: Dict, candidate_profile: Dict) -> str:
+        """Build the prompt that evaluates a candidate against a request"""
+
+        return self.EVALUATION_PROMPT_TEMPLATE.format(
+            request_json=json.dumps(request_query, indent=2),
+            profile_json=json.dumps(candidate_profile, indent=2)
+        )
+
+    def _evaluation_cache_key(self, request_query: Dict, candidate_profile: Dict) -> str:
+        """Canonical cache key for a (request, candidate) pair"""
+        return _cache_key(
+            json.dumps(request_query, sort_keys=True, default=str) +
+            json.dumps(candidate_profile, sort_keys=True, default=str)
+        )
+
+    def evaluate(self, request_query: Dict, candidate_profile: Dict) -> Dict[str, Any]:
+        """Evaluate if candidate matches the request using AI"""
+
+        key = self._evaluation_cache_key(request_query, candidate_profile)
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+
         try:
-            response = self.llm.invoke(prompt)
-            content = response.content
-
-            json_match = re.search(r'\{[\s\S]*\}', content)
-            if json_match:
-                evaluation = json.loads(json_match.group())
-                # Ensure required fields exist
-                evaluation.setdefault('is_match', False)
-                evaluation.setdefault('match_score', 0.0)
-                evaluation.setdefault('matched_skills', [])
-                evaluation.setdefault('explanation', 'No explanation provided')
-                return evaluation
+            evaluation = self.evaluator.invoke(
+                self._build_evaluation_prompt(request_query, candidate_profile)
+            ).model_dump()
+            _cache_put(key, evaluation)
+            return evaluation
         except Exception as e:
             print(f"Match evaluation error: {e}")
 
         # Fallback to simple matching
         return self._simple_match(request_query, candidate_profile)
 
+    async def aevaluate(self, request_query: Dict, candidate_profile: Dict) -> Dict[str, Any]:
+        """Async variant of evaluate"""
+
+        key = self._evaluation_cache_key(request_query, candidate_profile)
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            evaluation = (await self.evaluator.ainvoke(
+                self._build_evaluation_prompt(request_query, candidate_profile)
+            )).model_dump()
+            _cache_put(key, evaluation)
+            return evaluation
+        except Exception as e:
+            print(f"Match evaluation error: {e}")
+
+        # Fallback to simple matching
+        return self._simple_match(request_query, candidate_profile)
+
+    async def evaluate_batch(self, request_query: Dict, candidates: List[Dict]) -> List[Dict[str, Any]]:
+        """Evaluate all candidates concurrently, bounded by a semaphore"""
+
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_EVALUATIONS)
+
+        async def evaluate_one(candidate_profile: Dict) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.aevaluate(request_query, candidate_profile)
+
+        return await asyncio.gather(*[evaluate_one(c) for c in candidates])
+
     def _simple_match(self, request: Dict, profile: Dict) -> Dict:
         """Simple matching fallback"""
-        request_skills = set(s.lower() for s in request.get("skills", []))
-        profile_skills = set(s.lower() for s in (profile.get("skills") or []))
+        request_skills = self._lower_skills(request.get("skills") or [])
+        profile_skills = self._lower_skills(profile.get("skills") or [])
 
         matched = request_skills.intersection(profile_skills)
 
@@ -367,15 +720,28 @@ Be generous with matching - consider related skills (e.g., "React" matches "Fron
 class EmbeddingGenerator:
     """Generate embeddings for profiles and queries using Anthropic"""
 
+    # Cap on cached profile-text renderings
+    TEXT_CACHE_MAXSIZE = 10_000
+
     def __init__(self):
-        self.llm = ChatAnthropic(
-            anthropic_api_key=ANTHROPIC_API_KEY,
-            model="claude-sonnet-4-20250514",
-            temperature=0
-        )
+        self.llm = _anthropic_llm
+
+        # Rendered profile text keyed by profile content hash - profiles
+        # rarely change but are re-rendered on every search/match
+        self._text_cache: "OrderedDict[str, str]" = OrderedDict()
 
     def generate_profile_text(self, profile: Dict) -> str:
         """Convert profile to searchable text representation"""
+
+        key = hashlib.blake2b(
+            json.dumps(profile, sort_keys=True, default=str).encode(),
+            digest_size=16
+        ).hexdigest()
+        cached = self._text_cache.get(key)
+        if cached is not None:
+            self._text_cache.move_to_end(key)
+            return cached
+
         parts = []
 
         if profile.get('title'):
@@ -400,7 +766,11 @@ class EmbeddingGenerator:
         if profile.get('bio'):
             parts.append(f"Bio: {profile['bio']}")
 
-        return " | ".join(parts)
+        text = " | ".join(parts)
+        self._text_cache[key] = text
+        if len(self._text_cache) > self.TEXT_CACHE_MAXSIZE:
+            self._text_cache.popitem(last=False)
+        return text
 
     def generate_search_text(self, query: Dict) -> str:
         """Convert search query to text representation"""
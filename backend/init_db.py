@@ -34,29 +34,26 @@ def init_database():
     with open(schema_path, 'r') as f:
         schema_sql = f.read()
     
-    # Execute schema
-    with engine.connect() as conn:
-        # Execute in transaction
-        trans = conn.begin()
-        try:
-            # Split by statement (simple approach)
-            statements = [s.strip() for s in schema_sql.split(';') if s.strip()]
-            
-            for statement in statements:
-                if statement and not statement.startswith('/*'):
-                    try:
-                        conn.execute(text(statement))
-                    except Exception as e:
-                        # Ignore errors for already existing objects
-                        if 'already exists' not in str(e):
-                            print(f"Warning: {e}")
-            
-            trans.commit()
-            print("✓ Database schema initialized")
-        except Exception as e:
-            trans.rollback()
+    # Execute the whole script in one round-trip. psycopg2's simple query
+    # protocol accepts multi-statement scripts directly, and unlike the old
+    # split-on-';' loop it handles $$-quoted function bodies correctly.
+    raw_conn = engine.raw_connection()
+    try:
+        with raw_conn.cursor() as cursor:
+            cursor.execute(schema_sql)
+        raw_conn.commit()
+        print("✓ Database schema initialized")
+    except Exception as e:
+        raw_conn.rollback()
+        # On a re-run the first CREATE aborts the script - the schema is
+        # already in place
+        if 'already exists' in str(e):
+            print("✓ Database schema already initialized")
+        else:
             print(f"Error initializing database: {e}")
             raise
+    finally:
+        raw_conn.close()
 
 def add_sample_data():
     """Add sample data if requested"""
@@ -1,18 +1,30 @@
 """Main FastAPI application"""
 import os
-import json
+import asyncio
+
+import numpy as np
+import orjson
 from uuid import UUID, uuid4
-from typing import List
-from fastapi import FastAPI, HTTPException
+from typing import List, Optional
+from threading import RLock
+from cachetools import LRUCache, TTLCache
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from backend.models import (
     ProfileQuestion, ProfileData, SearchRequest,
     SearchResponse, MatchResult, AgentResponse, ConnectionCreate
 )
-from backend.database import execute_query, execute_function
+from backend.database import (
+    execute_query, execute_function, execute_batch_insert,
+    get_pool, close_pool
+)
 from backend.agent import profile_builder, search_agent, match_evaluator, embedding_generator
 
-app = FastAPI(title="Agent Network API", version="1.0.0")
+# orjson encodes responses in native code - the stdlib encoder walk is the
+# hot path when serializing large user/match lists
+app = FastAPI(title="Agent Network API", version="1.0.0",
+              default_response_class=ORJSONResponse)
 
 # CORS middleware
 app.add_middleware(
@@ -23,17 +35,109 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Store user names for conversation context
-user_names = {}
+# User names for conversation context - bounded LRU instead of a dict that
+# grew forever, with a lock since FastAPI may touch it from multiple threads
+_name_cache: LRUCache = LRUCache(maxsize=10_000)
+_name_lock = RLock()
+
+# Short-TTL response caches for the read-heavy list endpoints. Payloads are
+# small and a few seconds of staleness is fine, so an in-process TTLCache
+# beats a round-trip to the database (or an external cache tier) on most
+# hits. Only async handlers touch these, so no lock is needed.
+_users_cache: TTLCache = TTLCache(maxsize=1, ttl=5)
+_connections_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+
+
+# The name cache is keyed by UUID.int - hashing a native int beats hashing
+# a 36-character string on every lookup
+def _cache_user_name(user_id: UUID, name: str):
+    with _name_lock:
+        _name_cache[user_id.int] = name
+
+
+def _evict_user_name(user_id: UUID):
+    with _name_lock:
+        _name_cache.pop(user_id.int, None)
+
+
+@app.on_event("startup")
+async def startup():
+    """Warm the database pool so the first request doesn't pay for it"""
+    await get_pool()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await close_pool()
+
+
+async def _fetch_profiles_bulk(user_ids: List[str], required_skills: Optional[List[str]] = None) -> dict:
+    """Fetch name and profile for all given users in one query, keyed by id
+
+    When required_skills is given, only profiles containing at least one of
+    them are returned - the jsonb ?| probe rides the GIN index on
+    profiles.skills, culling obvious non-matches before any LLM evaluation.
+    """
+    if required_skills:
+        rows = await execute_query("""
+            SELECT u.id, u.name, p.user_id AS profile_user_id,
+                   p.title, p.bio, p.skills, p.experience_years,
+                   p.availability, p.location
+            FROM users u
+            JOIN profiles p ON p.user_id = u.id
+            WHERE u.id = ANY($1::uuid[])
+              AND p.skills ?| $2::text[]
+        """, user_ids, required_skills)
+    else:
+        rows = await execute_query("""
+            SELECT u.id, u.name, p.user_id AS profile_user_id,
+                   p.title, p.bio, p.skills, p.experience_years,
+                   p.availability, p.location
+            FROM users u
+            LEFT JOIN profiles p ON p.user_id = u.id
+            WHERE u.id = ANY($1::uuid[])
+        """, user_ids)
+
+    profiles = {}
+    for row in rows:
+        profile = None
+        if row['profile_user_id'] is not None:
+            profile = {
+                "title": row['title'],
+                "bio": row['bio'],
+                "skills": row['skills'],
+                "experience_years": row['experience_years'],
+                "availability": row['availability'],
+                "location": row['location']
+            }
+        profiles[str(row['id'])] = {"name": row['name'], "profile": profile}
+    return profiles
+
+
+async def _resolve_user_name(user_id: UUID) -> str:
+    """Get a user's name, falling back to the database if not cached"""
+    with _name_lock:
+        user_name = _name_cache.get(user_id.int)
+
+    if user_name is None:
+        user_data = await execute_query(
+            "SELECT name FROM users WHERE id = $1",
+            user_id
+        )
+        if user_data:
+            user_name = user_data[0]['name']
+            _cache_user_name(user_id, user_name)
+
+    return user_name or "User"
 
 
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Agent Network API", "version": "1.0.0"}
 
 
 @app.get("/health")
-def health_check():
+async def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
 
@@ -43,7 +147,7 @@ def health_check():
 # ============================================================================
 
 @app.post("/api/profile/start")
-def start_profile_building(email: str, name: str):
+async def start_profile_building(email: str, name: str):
     """Start profile building process"""
     try:
         # Validate inputs
@@ -51,31 +155,28 @@ def start_profile_building(email: str, name: str):
             raise HTTPException(status_code=400, detail="Email and name are required")
 
         # Create user if doesn't exist
-        existing = execute_query(
-            "SELECT id FROM users WHERE email = :email",
-            {"email": email}
-        )
-
-        if existing:
-            user_id = existing[0]['id']
-        else:
-            result = execute_query(
-                "INSERT INTO users (email, name) VALUES (:email, :name) RETURNING id",
-                {"email": email, "name": name}
-            )
-            user_id = result[0]['id']
+        # One round-trip: insert the user, or keep the existing row (and its
+        # name) if the email is already registered
+        result = await execute_query("""
+            INSERT INTO users (email, name) VALUES ($1, $2)
+            ON CONFLICT (email) DO UPDATE SET name = users.name
+            RETURNING id
+        """, email, name)
+        user_id = result[0]['id']
 
+        # The agent keys conversation state by string; the DB and the name
+        # cache take the native UUID
         user_id_str = str(user_id)
 
         # Store user name for conversation context
-        user_names[user_id_str] = name
+        _cache_user_name(user_id, name)
 
         # Reset agent memory for new conversation
         profile_builder.reset(user_id_str)
 
         # Get first question from agent - wrap in try/except to handle API key issues
         try:
-            response = profile_builder.chat(
+            response = await profile_builder.achat(
                 f"Hi! I'm {name}. I'd like to build my professional profile.",
                 user_id_str,
                 name
@@ -107,27 +208,17 @@ def start_profile_building(email: str, name: str):
 
 
 @app.post("/api/profile/chat")
-def continue_profile_chat(question: ProfileQuestion, user_id: UUID):
+async def continue_profile_chat(question: ProfileQuestion, user_id: UUID):
     """Continue profile building conversation"""
     try:
         user_id_str = str(user_id)
 
         # Get user name
-        user_name = user_names.get(user_id_str, "User")
-
-        # If we don't have the name, try to get it from DB
-        if user_name == "User":
-            user_data = execute_query(
-                "SELECT name FROM users WHERE id = :user_id",
-                {"user_id": user_id_str}
-            )
-            if user_data:
-                user_name = user_data[0]['name']
-                user_names[user_id_str] = user_name
+        user_name = await _resolve_user_name(user_id)
 
         # Chat with agent - wrap in try/except to handle API key issues
         try:
-            response = profile_builder.chat(
+            response = await profile_builder.achat(
                 question.user_message,
                 user_id_str,
                 user_name
@@ -154,57 +245,57 @@ def continue_profile_chat(question: ProfileQuestion, user_id: UUID):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/profile/chat/stream")
+async def stream_profile_chat(question: ProfileQuestion, user_id: UUID):
+    """Stream the profile building conversation as server-sent events.
+
+    Emits 'delta' events as response tokens arrive, then a final 'result'
+    event with the same payload as /api/profile/chat.
+    """
+    user_id_str = str(user_id)
+    user_name = await _resolve_user_name(user_id)
+
+    async def event_stream():
+        try:
+            async for event in profile_builder.astream_chat(
+                question.user_message,
+                user_id_str,
+                user_name
+            ):
+                yield b"data: " + orjson.dumps(event) + b"\n\n"
+        except Exception as agent_error:
+            print(f"Agent stream error: {agent_error}")
+            yield b"data: " + orjson.dumps({'type': 'error', 'message': 'I am having trouble processing your message right now. Please try again in a moment.'}) + b"\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @app.post("/api/profile/save")
-def save_profile(profile: ProfileData):
+async def save_profile(profile: ProfileData):
     """Save completed profile"""
     try:
         user_id_str = str(profile.user_id)
 
-        # Check if profile exists
-        existing = execute_query(
-            "SELECT id FROM profiles WHERE user_id = :user_id",
-            {"user_id": user_id_str}
-        )
-
         # Prepare profile data
-        skills_json = json.dumps(profile.skills) if profile.skills else '[]'
-        location_json = json.dumps(profile.location) if profile.location else None
-
-        if existing:
-            # Update existing
-            execute_query("""
-                UPDATE profiles
-                SET title = :title, bio = :bio, skills = CAST(:skills AS jsonb),
-                    experience_years = :exp, availability = :avail,
-                    location = CAST(:loc AS jsonb), updated_at = CURRENT_TIMESTAMP
-                WHERE user_id = :user_id
-            """, {
-                "user_id": user_id_str,
-                "title": profile.title,
-                "bio": profile.bio,
-                "skills": skills_json,
-                "exp": profile.experience_years,
-                "avail": profile.availability,
-                "loc": location_json
-            })
-        else:
-            # Insert new
-            execute_query("""
-                INSERT INTO profiles (user_id, title, bio, skills, experience_years, availability, location)
-                VALUES (:user_id, :title, :bio, CAST(:skills AS jsonb), :exp, :avail, CAST(:loc AS jsonb))
-            """, {
-                "user_id": user_id_str,
-                "title": profile.title,
-                "bio": profile.bio,
-                "skills": skills_json,
-                "exp": profile.experience_years,
-                "avail": profile.availability,
-                "loc": location_json
-            })
+        # The binary jsonb codec serializes these client-side; no dumps here
+        skills_json = profile.skills or []
+        location_json = profile.location
+
+        # Single UPSERT replaces the old exists-check + insert/update pair
+        await execute_query("""
+            INSERT INTO profiles (user_id, title, bio, skills, experience_years, availability, location)
+            VALUES ($1, $2, $3, $4, $5, $6, $7)
+            ON CONFLICT (user_id) DO UPDATE
+            SET title = EXCLUDED.title, bio = EXCLUDED.bio, skills = EXCLUDED.skills,
+                experience_years = EXCLUDED.experience_years,
+                availability = EXCLUDED.availability, location = EXCLUDED.location,
+                updated_at = CURRENT_TIMESTAMP
+        """, profile.user_id, profile.title, profile.bio, skills_json,
+            profile.experience_years, profile.availability, location_json)
 
         # Clear conversation state
         profile_builder.reset(user_id_str)
-        user_names.pop(user_id_str, None)
+        _evict_user_name(profile.user_id)
 
         return {"message": "Profile saved successfully", "user_id": user_id_str}
 
@@ -220,7 +311,7 @@ async def search_network(search: SearchRequest):
     """Search for matching professionals"""
     try:
         # Get user's connections
-        connections = execute_function("get_connections", str(search.user_id))
+        connections = await execute_function("get_connections", search.user_id)
 
         if not connections or len(connections) == 0:
             return {
@@ -231,83 +322,129 @@ async def search_network(search: SearchRequest):
             }
 
         # Process search query with agent
-        search_result = search_agent.process_search(search.query_text)
+        search_result = await search_agent.aprocess_search(search.query_text)
         structured_query = search_result["structured_query"]
-        structured_json = json.dumps(structured_query)
-
-        # Create service request
-        request_result = execute_query("""
+        # Create service request - the binary jsonb codec frames
+        # structured_query on the client, so Postgres skips the text parse
+        request_result = await execute_query("""
             INSERT INTO service_requests (requesting_user_id, query_text, structured_query)
-            VALUES (:user_id, :query, CAST(:structured AS jsonb))
+            VALUES ($1, $2, $3)
             RETURNING id
-        """, {
-            "user_id": str(search.user_id),
-            "query": search.query_text,
-            "structured": structured_json
-        })
+        """, search.user_id, search.query_text, structured_query)
 
         request_id = request_result[0]['id']
 
         # Broadcast to network
-        broadcast_result = execute_function(
+        broadcast_result = await execute_function(
             "broadcast_request",
-            str(search.user_id),
-            str(request_id)
+            search.user_id,
+            request_id
         )
 
-        # Evaluate each connected user
-        matches = []
-        for conn in connections:
-            conn_user_id = conn['user_id']
-
-            # Get candidate profile
-            profile_data = execute_function("get_user_profile", conn_user_id)
+        # One round-trip fetches every candidate's name and profile,
+        # replacing the per-connection get_user_profile calls. When the
+        # query names required skills, profiles lacking all of them are
+        # culled in SQL so they never reach the LLM evaluator. The fallback
+        # structurer emits the "General" sentinel when no known skill is
+        # named - no profile contains that literal, so filtering on it
+        # would cull everyone; degrade to the unfiltered scan instead.
+        required_skills = structured_query.get('skills') or None
+        if required_skills == ["General"]:
+            required_skills = None
+        profiles_by_id = await _fetch_profiles_bulk(
+            [conn['user_id'] for conn in connections],
+            required_skills=required_skills
+        )
 
-            if not profile_data or not profile_data.get('profile'):
-                continue
+        # Collect candidates that have a profile
+        candidates = [
+            (conn, profiles_by_id[conn['user_id']])
+            for conn in connections
+            if profiles_by_id.get(conn['user_id'], {}).get('profile')
+        ]
+
+        # Evaluate all candidates concurrently
+        evaluations = await match_evaluator.evaluate_batch(
+            structured_query,
+            [profile_data['profile'] for _, profile_data in candidates]
+        )
 
-            # Evaluate match using agent - with fallback
-            try:
-                evaluation = match_evaluator.evaluate(
-                    structured_query,
-                    profile_data['profile']
-                )
-            except Exception as eval_err:
-                print(f"Match evaluation error: {eval_err}")
-                # Fallback to simple matching
-                evaluation = match_evaluator._simple_match(
-                    structured_query,
-                    profile_data['profile']
-                )
-
-            # Record response
-            execute_function(
-                "record_agent_response",
-                str(request_id),
+        matches = []
+        response_rows = []
+        message_rows = []
+        # Loop invariants hoisted to locals - repeated dict lookups inside a
+        # tight loop are pure interpreter overhead. The UUIDs go to the DB
+        # natively; only the response payload needs the string form.
+        request_id_str = str(request_id)
+        search_user_id = search.user_id
+        for (conn, profile_data), evaluation in zip(candidates, evaluations):
+            conn_user_id = conn['user_id']
+            is_match = evaluation.get('is_match', False)
+            match_score = evaluation.get('match_score', 0.0)
+            matched_skills = evaluation.get('matched_skills') or []
+            explanation = evaluation.get('explanation', '')
+
+            # Accumulate rows for one batched insert after the loop
+            response_rows.append((
+                request_id,
                 conn_user_id,
-                json.dumps(evaluation)
-            )
-
-            if evaluation.get('is_match'):
+                is_match,
+                match_score,
+                explanation,
+                matched_skills
+            ))
+            message_rows.append((
+                conn_user_id,
+                search_user_id,
+                'response',
+                {'is_match': is_match},
+                request_id
+            ))
+
+            if is_match:
+                trust_score = conn.get('trust_score', 1.0)
                 matches.append({
                     "user_id": conn_user_id,
                     "name": profile_data['name'],
                     "title": profile_data['profile'].get('title'),
-                    "match_score": evaluation['match_score'],
-                    "matched_skills": evaluation.get('matched_skills', []),
-                    "explanation": evaluation.get('explanation', ''),
-                    "trust_score": conn.get('trust_score', 1.0),
-                    "final_score": evaluation['match_score'] * 0.7 + conn.get('trust_score', 1.0) * 0.3
+                    "match_score": match_score,
+                    "matched_skills": matched_skills,
+                    "explanation": explanation,
+                    "trust_score": trust_score,
+                    "final_score": match_score * 0.7 + trust_score * 0.3
                 })
 
-        # Sort by final score
-        matches.sort(key=lambda x: x['final_score'], reverse=True)
+        # Record all evaluations and their audit messages in two batched
+        # inserts instead of one record_agent_response round-trip each
+        await execute_batch_insert(
+            """INSERT INTO agent_responses
+               (request_id, responding_user_id, is_match, match_score, match_explanation, matched_skills)
+               VALUES ($1, $2, $3, $4, $5, $6)""",
+            response_rows
+        )
+        await execute_batch_insert(
+            """INSERT INTO agent_messages
+               (from_user_id, to_user_id, message_type, payload, request_id)
+               VALUES ($1, $2, $3, $4, $5)""",
+            message_rows
+        )
 
-        return {
-            "request_id": str(request_id),
+        # Sort by final score - one C-level argsort over a contiguous float
+        # array instead of a keyed Timsort calling a lambda per comparison
+        if matches:
+            scores = np.fromiter(
+                (m['final_score'] for m in matches),
+                dtype=np.float32, count=len(matches)
+            )
+            matches = [matches[i] for i in np.argsort(-scores, kind='stable')]
+
+        # Large payload - return the response directly so FastAPI skips the
+        # jsonable_encoder walk over every match dict
+        return ORJSONResponse(content={
+            "request_id": request_id_str,
             "matches": matches,
             "total_contacted": len(connections)
-        }
+        })
 
     except Exception as e:
         print(f"Search error: {e}")
@@ -318,25 +455,26 @@ async def search_network(search: SearchRequest):
 # ============================================================================
 
 @app.post("/api/connections")
-def create_connection(connection: ConnectionCreate):
+async def create_connection(connection: ConnectionCreate):
     """Create connection between two users"""
     try:
-        execute_query("""
+        await execute_query("""
             INSERT INTO connections (user_a_id, user_b_id, trust_score)
-            VALUES (:user_a, :user_b, 1.0)
+            VALUES ($1, $2, 1.0)
             ON CONFLICT DO NOTHING
-        """, {
-            "user_a": str(connection.user_a_id),
-            "user_b": str(connection.user_b_id)
-        })
-        
+        """, connection.user_a_id, connection.user_b_id)
+
+        # Both users' cached connection lists are now stale
+        _connections_cache.pop(connection.user_a_id.int, None)
+        _connections_cache.pop(connection.user_b_id.int, None)
+
         return {"message": "Connection created successfully"}
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/connections/{user_id}")
-def get_user_connections(user_id: str):
+async def get_user_connections(user_id: str):
     """Get all connections for a user"""
     try:
         # Validate user_id is a valid UUID
@@ -344,12 +482,18 @@ def get_user_connections(user_id: str):
             return {"connections": [], "error": "Invalid user ID"}
 
         try:
-            UUID(user_id)
+            user_uuid = UUID(user_id)
         except ValueError:
             return {"connections": [], "error": "Invalid user ID format"}
 
-        connections = execute_function("get_connections", user_id)
-        return {"connections": connections or []}
+        # Keyed by UUID.int so differently-cased path strings share an entry
+        cached = _connections_cache.get(user_uuid.int)
+        if cached is not None:
+            return {"connections": cached}
+
+        connections = await execute_function("get_connections", user_uuid) or []
+        _connections_cache[user_uuid.int] = connections
+        return {"connections": connections}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -359,27 +503,77 @@ def get_user_connections(user_id: str):
 # ============================================================================
 
 @app.get("/api/users")
-def list_users():
-    """List all users"""
+async def list_users():
+    """Stream all users as NDJSON, one row per line
+
+    Rows are piped straight from a server-side cursor in batches of 1000,
+    so time-to-first-byte is first-row latency and memory stays bounded by
+    the batch size instead of the full join result.
+    """
+    users_sql = """
+        SELECT u.id, u.email, u.name, u.created_at,
+               p.title, p.skills
+        FROM users u
+        LEFT JOIN profiles p ON u.id = p.user_id
+        ORDER BY u.created_at DESC
+    """
+
+    cached = _users_cache.get('users')
+    if cached is not None:
+        return Response(content=cached, media_type="application/x-ndjson")
+
+    # Acquire the connection and open the cursor before the response is
+    # constructed, so pool or query failures still surface as a 500 instead
+    # of an empty 200 body
     try:
-        users = execute_query("""
-            SELECT u.id, u.email, u.name, u.created_at,
-                   p.title, p.skills
-            FROM users u
-            LEFT JOIN profiles p ON u.id = p.user_id
-            ORDER BY u.created_at DESC
-        """)
-        
-        return {"users": users or []}
-    
+        pool = await get_pool()
+        conn = await pool.acquire()
+        try:
+            # Cursors require a transaction to hold their portal open.
+            # Awaiting the factory declares the portal and executes the
+            # query, so bad SQL or a dead connection fails here, not
+            # mid-stream. (prefetch is only valid when iterating the
+            # factory directly; an awaited Cursor is paged via fetch().)
+            tx = conn.transaction()
+            await tx.start()
+            cursor = await conn.cursor(users_sql)
+        except BaseException:
+            await pool.release(conn)
+            raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    async def generate():
+        chunks = []
+        try:
+            while True:
+                batch = await cursor.fetch(1000)
+                if not batch:
+                    break
+                for record in batch:
+                    line = orjson.dumps(dict(record)) + b"\n"
+                    chunks.append(line)
+                    yield line
+        except Exception as e:
+            # Headers are already sent once streaming starts; log and stop
+            print(f"User list stream error: {e}")
+            return
+        finally:
+            try:
+                await tx.rollback()
+            finally:
+                await pool.release(conn)
+        # Cache the rendered payload so repeat hits within the TTL skip
+        # both the query and the per-row serialization
+        _users_cache['users'] = b"".join(chunks)
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
 @app.get("/api/profile/{user_id}")
-def get_profile(user_id: UUID):
+async def get_profile(user_id: UUID):
     """Get user profile"""
     try:
-        profile = execute_function("get_user_profile", str(user_id))
+        profile = await execute_function("get_user_profile", user_id)
         
         if not profile:
             raise HTTPException(status_code=404, detail="User not found")
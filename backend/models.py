@@ -1,14 +1,23 @@
 """Pydantic models for API requests and responses"""
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from uuid import UUID
 
+# Shared config for incoming payloads: schemas are compiled eagerly at
+# import time instead of on first use, and instances are frozen - requests
+# are never mutated after validation
+_REQUEST_MODEL_CONFIG = ConfigDict(defer_build=False, frozen=True, populate_by_name=True)
+
 # Request Models
 class ProfileQuestion(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     user_message: str
 
 class ProfileData(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     user_id: UUID
     title: Optional[str] = None
     bio: Optional[str] = None
@@ -18,13 +27,25 @@ class ProfileData(BaseModel):
     location: Optional[Dict[str, str]] = None
 
 class SearchRequest(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     user_id: UUID
     query_text: str
 
 class ConnectionCreate(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     user_a_id: UUID
     user_b_id: UUID
 
+# Prebuilt pydantic-core validators for callers that validate payloads
+# outside FastAPI's dependency machinery - validate_python on these skips
+# model re-construction entirely
+PROFILE_QUESTION_VALIDATOR = ProfileQuestion.__pydantic_validator__
+PROFILE_DATA_VALIDATOR = ProfileData.__pydantic_validator__
+SEARCH_REQUEST_VALIDATOR = SearchRequest.__pydantic_validator__
+CONNECTION_CREATE_VALIDATOR = ConnectionCreate.__pydantic_validator__
+
 # Response Models
 class User(BaseModel):
     id: UUID
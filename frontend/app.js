@@ -472,15 +472,24 @@ async function loadConnections() {
     }
 }
 
+// /api/users streams NDJSON - one JSON object per line
+async function fetchUsers() {
+    const response = await fetch(`${API_BASE}/api/users`);
+    const text = await response.text();
+    return text
+        .split('\n')
+        .filter(line => line.trim().length > 0)
+        .map(line => JSON.parse(line));
+}
+
 async function loadAllUsers() {
     try {
-        const response = await fetch(`${API_BASE}/api/users`);
-        const data = await response.json();
-        
+        const users = await fetchUsers();
+
         const select = document.getElementById('connect-user-select');
         select.innerHTML = '<option value="">Select a user...</option>';
-        
-        data.users
+
+        users
             .filter(u => u.id !== currentUser.id)
             .forEach(user => {
                 const option = document.createElement('option');
@@ -535,18 +544,17 @@ async function addConnection() {
 
 async function loadExistingUsers() {
     try {
-        const response = await fetch(`${API_BASE}/api/users`);
-        const data = await response.json();
-        
+        const users = await fetchUsers();
+
         const listDiv = document.getElementById('users-list');
         listDiv.innerHTML = '';
-        
-        if (!data.users || data.users.length === 0) {
+
+        if (users.length === 0) {
             listDiv.innerHTML = '<p>No users yet. Be the first!</p>';
             return;
         }
-        
-        data.users.forEach(user => {
+
+        users.forEach(user => {
             const card = document.createElement('div');
             card.className = 'user-card';
             card.onclick = () => selectExistingUser(user);
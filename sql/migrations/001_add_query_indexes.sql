@@ -0,0 +1,26 @@
+-- ============================================================================
+-- Migration 001: indexes matching the hot query patterns
+-- ============================================================================
+-- For databases initialized from an older schema.sql. Fresh installs get
+-- these from schema.sql directly.
+--
+-- users(email) and profiles(user_id) are already backed by their UNIQUE
+-- constraints plus idx_users_email / idx_profiles_user_id, so they are not
+-- repeated here.
+--
+-- CONCURRENTLY cannot run inside a transaction block; apply with autocommit,
+-- e.g.  psql -d agent_network -f sql/migrations/001_add_query_indexes.sql
+
+-- ORDER BY created_at DESC in /api/users
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_created_at
+    ON users(created_at DESC);
+
+-- Covering indexes so get_connections resolves from an index-only scan
+-- without touching the heap; these supersede the single-column indexes
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_connections_user_a_covering
+    ON connections(user_a_id) INCLUDE (user_b_id, trust_score, established_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_connections_user_b_covering
+    ON connections(user_b_id) INCLUDE (user_a_id, trust_score, established_at);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_connections_user_a;
+DROP INDEX CONCURRENTLY IF EXISTS idx_connections_user_b;
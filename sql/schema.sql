@@ -403,15 +403,19 @@ $$ LANGUAGE plpgsql;
 
 -- User lookups
 CREATE INDEX idx_users_email ON users(email);
+CREATE INDEX idx_users_created_at ON users(created_at DESC);
 
 -- Profile searches
 CREATE INDEX idx_profiles_user_id ON profiles(user_id);
 CREATE INDEX idx_profiles_skills ON profiles USING GIN(skills);
 CREATE INDEX idx_profiles_embedding ON profiles USING ivfflat(embedding vector_cosine_ops);
 
--- Connection queries
-CREATE INDEX idx_connections_user_a ON connections(user_a_id);
-CREATE INDEX idx_connections_user_b ON connections(user_b_id);
+-- Connection queries - covering indexes so get_connections resolves from an
+-- index-only scan without touching the heap
+CREATE INDEX idx_connections_user_a ON connections(user_a_id)
+    INCLUDE (user_b_id, trust_score, established_at);
+CREATE INDEX idx_connections_user_b ON connections(user_b_id)
+    INCLUDE (user_a_id, trust_score, established_at);
 
 -- Request tracking
 CREATE INDEX idx_requests_user ON service_requests(requesting_user_id);